@@ -0,0 +1,40 @@
+"""
+Preprocessing helpers for ML Insights Platform
+
+Functions used inside saved model pipelines live in this module so that
+pickled pipelines reference them by an importable name, whether the model
+was trained by running ml_trainer.py as a script or by importing it.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def normalize_categorical(X: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert categorical values to strings and every missing marker to NaN.
+
+    CSV parsers disagree on categorical values: PyArrow yields None for
+    missing strings, while pandas' C engine yields NaN, and mixed columns
+    (e.g. booleans with gaps) hold non-string objects. Normalizing keeps the
+    encoder independent of the parser. Columns that already hold only
+    strings are not converted.
+
+    Args:
+        X: Categorical feature columns
+
+    Returns:
+        Object-dtype dataframe of strings, with NaN for missing values
+    """
+    X = pd.DataFrame(X)
+    normalized = {}
+    for col in X.columns:
+        values = X[col].to_numpy(dtype=object)
+        missing = pd.isna(values)
+        if pd.api.types.infer_dtype(values, skipna=True) != 'string':
+            values = np.where(missing, np.nan, values.astype(str).astype(object))
+        elif missing.any():
+            values = values.copy()
+            values[missing] = np.nan
+        normalized[col] = values
+    return pd.DataFrame(normalized, index=X.index, columns=X.columns)
@@ -7,33 +7,68 @@ It supports multiple algorithms for classification and regression tasks.
 
 import os
 import sys
+import csv
 import json
+import base64
 import joblib
 import logging
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime
 
 import pandas as pd
 import numpy as np
+from sklearn import config_context
+from sklearn.utils import assert_all_finite
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
+from sklearn.preprocessing import (
+    FunctionTransformer, LabelEncoder, OrdinalEncoder, StandardScaler
+)
 
 # Classification models
 from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
 from sklearn.neighbors import KNeighborsClassifier
 
 # Regression models
 from sklearn.linear_model import LinearRegression
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
 from sklearn.neighbors import KNeighborsRegressor
 
 # Metrics
 from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score, roc_auc_score,
-    confusion_matrix, mean_squared_error, mean_absolute_error, r2_score
+    precision_recall_fscore_support, roc_auc_score, confusion_matrix
 )
+from sklearn.inspection import permutation_importance
+
+from ml_preprocessing import normalize_categorical
+
+# PyArrow's multithreaded CSV parser is used when available
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+# Models are LZ4-compressed when lz4 is installed; otherwise they are saved
+# uncompressed so numpy payloads can be memory-mapped on load
+try:
+    import lz4  # noqa: F401
+    MODEL_COMPRESSION = ('lz4', 3)
+except ImportError:
+    MODEL_COMPRESSION = 0
+
+# Uncompressed joblib files are plain pickles, which start with PROTO (0x80)
+PICKLE_MAGIC = b'\x80'
+
+# Confusion matrices with more cells than this are base64-encoded in metrics
+CONFUSION_MATRIX_LIST_MAX_SIZE = 256
+
+# Permutation importance settings for models without built-in importances
+PERMUTATION_IMPORTANCE_REPEATS = 5
+PERMUTATION_IMPORTANCE_MAX_SAMPLES = 5000
 
 # Configure logging
 logging.basicConfig(
@@ -43,6 +78,114 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _csv_convert_options(column_types: Optional[Dict[str, Any]] = None):
+    """PyArrow conversion options shared by training and prediction reads."""
+    # Empty string cells are missing values, as with pandas' own parser
+    return pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True)
+
+
+def read_csv(filepath: str) -> pd.DataFrame:
+    """
+    Load a CSV file, using PyArrow's parser when it is installed.
+
+    Dates and times are kept as their original strings, as pandas' parser
+    does, so prediction can read them as plain strings too.
+
+    Args:
+        filepath: Path to the CSV file
+
+    Returns:
+        Loaded dataframe
+    """
+    if pa is None:
+        return pd.read_csv(filepath)
+
+    table = pa_csv.read_csv(filepath, convert_options=_csv_convert_options())
+    temporal = {
+        field.name: pa.string()
+        for field in table.schema
+        if pa.types.is_temporal(field.type)
+    }
+    if temporal:
+        table = pa_csv.read_csv(filepath, convert_options=_csv_convert_options(temporal))
+    return table.to_pandas()
+
+
+def read_csv_chunks(
+    filepath: str,
+    column_types: Dict[str, str],
+    string_columns: List[str],
+    chunksize: int,
+    block_size: int
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CSV file in chunks, parsed the same way as read_csv.
+
+    With PyArrow, columns in column_types are converted to the recorded
+    Arrow types and all other columns are read as strings, so types never
+    depend on which block a value falls in. Without PyArrow, pandas' C engine
+    is used with string_columns read as str.
+
+    Args:
+        filepath: Path to the CSV file
+        column_types: Arrow type aliases by column (see arrow_column_types)
+        string_columns: Columns to read as strings with the pandas fallback
+        chunksize: Rows per chunk with the pandas fallback
+        block_size: Bytes per block with PyArrow
+
+    Yields:
+        Dataframe chunks
+    """
+    if pa is None:
+        with pd.read_csv(
+            filepath,
+            chunksize=chunksize,
+            dtype={col: str for col in string_columns}
+        ) as chunks:
+            yield from chunks
+        return
+
+    with open(filepath, newline='') as f:
+        header = next(csv.reader(f))
+    types = {col: pa.string() for col in header}
+    types.update({col: pa.type_for_alias(alias) for col, alias in column_types.items()})
+
+    reader = pa_csv.open_csv(
+        filepath,
+        read_options=pa_csv.ReadOptions(block_size=block_size),
+        convert_options=_csv_convert_options(types)
+    )
+    batches_read = 0
+    for batch in reader:
+        batches_read += 1
+        yield batch.to_pandas()
+    if batches_read == 0:
+        # Header-only file: yield one empty chunk, as pandas does
+        yield reader.schema.empty_table().to_pandas()
+
+
+def arrow_column_types(X: pd.DataFrame) -> Dict[str, str]:
+    """
+    Record the Arrow type to parse each numeric or boolean column as.
+
+    Integer columns are recorded as double so that prediction files with
+    fractional values still parse; every other column is read as a string.
+
+    Args:
+        X: Dataframe loaded with read_csv
+
+    Returns:
+        Arrow type alias by numeric or boolean column
+    """
+    column_types = {}
+    for col, dtype in X.dtypes.items():
+        if dtype.kind == 'b':
+            column_types[col] = 'bool'
+        elif dtype.kind in 'iuf':
+            column_types[col] = 'double'
+    return column_types
+
+
 class MLTrainer:
     """
     Machine Learning model trainer supporting multiple algorithms.
@@ -56,17 +199,26 @@ class MLTrainer:
     CLASSIFICATION_ALGORITHMS = {
         'logistic_regression': LogisticRegression,
         'random_forest': RandomForestClassifier,
-        'gradient_boosting': GradientBoostingClassifier,
+        'gradient_boosting': HistGradientBoostingClassifier,
         'knn': KNeighborsClassifier
     }
 
     REGRESSION_ALGORITHMS = {
         'linear_regression': LinearRegression,
         'random_forest': RandomForestRegressor,
-        'gradient_boosting': GradientBoostingRegressor,
+        'gradient_boosting': HistGradientBoostingRegressor,
         'knn': KNeighborsRegressor
     }
 
+    # Algorithms whose estimators accept n_jobs for multi-core fit/predict
+    PARALLEL_ALGORITHMS = {'random_forest', 'knn'}
+
+    # Renamed hyperparameters per algorithm (None drops the parameter);
+    # HistGradientBoosting uses max_iter and threads via OpenMP
+    HYPERPARAMETER_ALIASES = {
+        'gradient_boosting': {'n_estimators': 'max_iter', 'n_jobs': None}
+    }
+
     def __init__(self, algorithm: str, problem_type: str, hyperparameters: Dict[str, Any]):
         """
         Initialize the ML trainer.
@@ -78,11 +230,21 @@ class MLTrainer:
         """
         self.algorithm = algorithm
         self.problem_type = problem_type
-        self.hyperparameters = hyperparameters
+        self.hyperparameters = dict(hyperparameters)
+        for name, alias in self.HYPERPARAMETER_ALIASES.get(algorithm, {}).items():
+            if name in self.hyperparameters:
+                value = self.hyperparameters.pop(name)
+                if alias is not None:
+                    self.hyperparameters.setdefault(alias, value)
+        if algorithm in self.PARALLEL_ALGORITHMS:
+            # Use all cores unless the caller asked otherwise
+            self.hyperparameters.setdefault('n_jobs', -1)
         self.model = None
-        self.scaler = None
+        self.pipeline = None
         self.label_encoder = None
         self.feature_names = []
+        self.categorical_features = []
+        self.feature_types = {}
 
     def _get_model_class(self):
         """Get the model class based on algorithm and problem type."""
@@ -91,55 +253,109 @@ class MLTrainer:
         else:
             return self.REGRESSION_ALGORITHMS.get(self.algorithm)
 
-    def _preprocess_data(
-        self,
-        X: pd.DataFrame,
-        y: pd.Series,
-        is_training: bool = True
-    ) -> Tuple[np.ndarray, np.ndarray]:
+    def _can_warm_start(self, model_class) -> bool:
         """
-        Preprocess features and target variable.
+        Check whether the existing forest can be extended instead of refit.
+
+        This holds when the current model is a random forest of the same
+        class, all other parameters (including defaults) are unchanged and
+        more trees are requested.
 
         Args:
-            X: Feature dataframe
-            y: Target series
-            is_training: Whether this is training data
+            model_class: Model class for the current configuration
 
         Returns:
-            Preprocessed X and y as numpy arrays
+            True if only the additional trees need to be fit
         """
-        # Store feature names
-        if is_training:
-            self.feature_names = X.columns.tolist()
-
-        # Handle missing values
-        if X.isnull().any().any():
-            logger.info("Handling missing values in features")
-            imputer = SimpleImputer(strategy='mean')
-            X = pd.DataFrame(
-                imputer.fit_transform(X),
-                columns=X.columns,
-                index=X.index
-            )
+        if not isinstance(self.model, (RandomForestClassifier, RandomForestRegressor)):
+            return False
+        if type(self.model) is not model_class:
+            return False
+
+        requested = model_class(**self.hyperparameters)
+        current_params = self.model.get_params()
+        requested_params = requested.get_params()
+        for name in ('n_estimators', 'warm_start'):
+            current_params.pop(name)
+            requested_params.pop(name)
+        if current_params != requested_params:
+            return False
+
+        return requested.n_estimators > self.model.n_estimators
+
+    def _build_pipeline(self, X: pd.DataFrame, model) -> Pipeline:
+        """
+        Build the preprocessing + model pipeline from the feature dtypes.
 
-        # Encode categorical variables
-        categorical_cols = X.select_dtypes(include=['object', 'category']).columns
-        if len(categorical_cols) > 0:
-            logger.info(f"Encoding categorical features: {list(categorical_cols)}")
-            for col in categorical_cols:
-                le = LabelEncoder()
-                X[col] = le.fit_transform(X[col].astype(str))
+        Numeric columns are mean-imputed and all other columns are
+        ordinal-encoded, with unseen and missing values mapped to -1. For
+        scale-sensitive algorithms every encoded column is then standardized.
+
+        Args:
+            X: Training feature dataframe
+            model: Estimator to place at the end of the pipeline
+
+        Returns:
+            Unfitted pipeline
+        """
+        # Store feature names and parsed types (so prediction parses the same way)
+        self.feature_names = X.columns.tolist()
+        self.feature_types = arrow_column_types(X)
+
+        numeric_cols = X.select_dtypes(include=[np.number, 'bool']).columns.tolist()
+        self.categorical_features = [col for col in self.feature_names if col not in numeric_cols]
+        if self.categorical_features:
+            logger.info(f"Encoding categorical features: {self.categorical_features}")
+
+        numeric_pipeline = SimpleImputer(strategy='mean')
+        categorical_pipeline = Pipeline([
+            ('normalize', FunctionTransformer(
+                normalize_categorical,
+                feature_names_out='one-to-one'
+            )),
+            ('encoder', OrdinalEncoder(
+                handle_unknown='use_encoded_value',
+                unknown_value=-1,
+                encoded_missing_value=-1,
+                dtype=np.float32
+            ))
+        ])
+        preprocessor = ColumnTransformer(
+            [
+                ('numeric', numeric_pipeline, numeric_cols),
+                ('categorical', categorical_pipeline, self.categorical_features)
+            ],
+            verbose_feature_names_out=False
+        )
 
         # Scale features (important for distance-based algorithms)
-        if self.algorithm in ['logistic_regression', 'knn']:
-            if is_training:
-                self.scaler = StandardScaler()
-                X_scaled = self.scaler.fit_transform(X)
-            else:
-                X_scaled = self.scaler.transform(X)
-            X = pd.DataFrame(X_scaled, columns=X.columns, index=X.index)
+        needs_scaling = self.algorithm in ['logistic_regression', 'knn']
+
+        # Contiguous float32 features avoid an internal copy/upcast in the model
+        to_float32 = FunctionTransformer(
+            np.ascontiguousarray,
+            kw_args={'dtype': np.float32},
+            feature_names_out='one-to-one'
+        )
+
+        return Pipeline([
+            ('preprocessor', preprocessor),
+            ('scaler', StandardScaler() if needs_scaling else 'passthrough'),
+            ('to_float32', to_float32),
+            ('model', model)
+        ])
+
+    def _encode_target(self, y: pd.Series, is_training: bool = True) -> np.ndarray:
+        """
+        Encode the target variable.
+
+        Args:
+            y: Target series
+            is_training: Whether this is training data
 
-        # Handle target variable
+        Returns:
+            Target as a numpy array
+        """
         if self.problem_type == 'classification':
             if y.dtype == 'object' or y.dtype.name == 'category':
                 if is_training:
@@ -148,7 +364,7 @@ class MLTrainer:
                 else:
                     y = self.label_encoder.transform(y)
 
-        return X.values, y.values if isinstance(y, pd.Series) else y
+        return y.values if isinstance(y, pd.Series) else y
 
     def train(
         self,
@@ -171,35 +387,58 @@ class MLTrainer:
         """
         start_time = datetime.now()
 
-        # Preprocess data
-        logger.info("Preprocessing training data")
-        X_train_processed, y_train_processed = self._preprocess_data(
-            X_train, y_train, is_training=True
-        )
-        X_test_processed, y_test_processed = self._preprocess_data(
-            X_test, y_test, is_training=False
-        )
-
         # Initialize model
         model_class = self._get_model_class()
         if model_class is None:
             raise ValueError(f"Unknown algorithm: {self.algorithm}")
 
-        logger.info(f"Initializing {self.algorithm} model with hyperparameters: {self.hyperparameters}")
-        self.model = model_class(**self.hyperparameters)
-
-        # Train model
-        logger.info("Training model...")
-        self.model.fit(X_train_processed, y_train_processed)
-
-        # Make predictions
-        y_pred = self.model.predict(X_test_processed)
-
-        # Calculate metrics
-        metrics = self._calculate_metrics(y_test_processed, y_pred, X_test_processed)
+        # A warm-started forest keeps its trees, so it must also keep the
+        # fitted preprocessing and target encoding those trees were built on
+        warm_start = self._can_warm_start(model_class)
+
+        # Encode target
+        y_train_processed = self._encode_target(y_train, is_training=not warm_start)
+        y_test_processed = self._encode_target(y_test, is_training=False)
+
+        # Preprocessing never touches the target, so check it here before the
+        # finiteness checks are switched off below
+        assert_all_finite(y_train_processed, input_name='y')
+        assert_all_finite(y_test_processed, input_name='y')
+
+        # Preprocess features (test features are transformed once and reused
+        # for probability-based metrics)
+        logger.info("Preprocessing data")
+        if warm_start:
+            n_estimators = model_class(**self.hyperparameters).n_estimators
+            logger.info(f"Growing existing forest to {n_estimators} trees")
+            self.model.set_params(warm_start=True, n_estimators=n_estimators)
+            X_train_processed = self.pipeline[:-1].transform(X_train)
+        else:
+            logger.info(f"Initializing {self.algorithm} model with hyperparameters: {self.hyperparameters}")
+            self.model = model_class(**self.hyperparameters)
+            self.pipeline = self._build_pipeline(X_train, self.model)
+            X_train_processed = self.pipeline[:-1].fit_transform(X_train, y_train_processed)
+        X_test_processed = self.pipeline[:-1].transform(X_test)
+
+        # The preprocessor rejects infinities and imputes NaNs in X and the
+        # target was validated above, so the model can skip sklearn's
+        # finiteness scans
+        with config_context(assume_finite=True):
+            # Train model
+            logger.info("Training model...")
+            self.model.fit(X_train_processed, y_train_processed)
+            if warm_start:
+                # Saved models start a fresh forest if refit elsewhere
+                self.model.set_params(warm_start=False)
+
+            # Make predictions
+            y_pred = self.model.predict(X_test_processed)
+
+            # Calculate metrics
+            metrics = self._calculate_metrics(y_test_processed, y_pred, X_test_processed)
 
         # Get feature importance
-        feature_importance = self._get_feature_importance()
+        feature_importance = self._get_feature_importance(X_test_processed, y_test_processed)
 
         # Calculate training duration
         training_duration = (datetime.now() - start_time).total_seconds()
@@ -233,21 +472,19 @@ class MLTrainer:
 
         if self.problem_type == 'classification':
             # Classification metrics
-            metrics['accuracy'] = float(accuracy_score(y_true, y_pred))
+            cm = confusion_matrix(y_true, y_pred)
+            metrics['accuracy'] = float(cm.trace() / cm.sum())
 
             # Handle binary vs multiclass
             n_classes = len(np.unique(y_true))
             average = 'binary' if n_classes == 2 else 'weighted'
 
-            metrics['precision'] = float(precision_score(
-                y_true, y_pred, average=average, zero_division=0
-            ))
-            metrics['recall'] = float(recall_score(
-                y_true, y_pred, average=average, zero_division=0
-            ))
-            metrics['f1_score'] = float(f1_score(
+            precision, recall, f1, _ = precision_recall_fscore_support(
                 y_true, y_pred, average=average, zero_division=0
-            ))
+            )
+            metrics['precision'] = float(precision)
+            metrics['recall'] = float(recall)
+            metrics['f1_score'] = float(f1)
 
             # ROC-AUC for binary classification with probability support
             if n_classes == 2 and hasattr(self.model, 'predict_proba'):
@@ -260,26 +497,53 @@ class MLTrainer:
             else:
                 metrics['roc_auc'] = None
 
-            # Confusion matrix
-            cm = confusion_matrix(y_true, y_pred)
-            metrics['confusion_matrix'] = cm.tolist()
+            # Confusion matrix; large matrices are sent as a base64 buffer of
+            # little-endian int32 counts (row-major) instead of nested lists
+            if cm.size > CONFUSION_MATRIX_LIST_MAX_SIZE:
+                metrics['confusion_matrix_b64'] = base64.b64encode(
+                    cm.astype('<i4').tobytes()
+                ).decode('ascii')
+                metrics['confusion_matrix_shape'] = list(cm.shape)
+            else:
+                metrics['confusion_matrix'] = cm.tolist()
 
             logger.info(f"Classification metrics - Accuracy: {metrics['accuracy']:.4f}, F1: {metrics['f1_score']:.4f}")
 
         else:
-            # Regression metrics
-            metrics['rmse'] = float(np.sqrt(mean_squared_error(y_true, y_pred)))
-            metrics['mae'] = float(mean_absolute_error(y_true, y_pred))
-            metrics['r2'] = float(r2_score(y_true, y_pred))
+            # Regression metrics, all derived from one residual array
+            y_true = np.asarray(y_true, dtype=np.float64)
+            diff = y_true - np.asarray(y_pred, dtype=np.float64)
+            sq = diff * diff
+            metrics['rmse'] = float(np.sqrt(sq.mean()))
+            metrics['mae'] = float(np.abs(diff).mean())
+
+            # A constant target scores 1.0 only for a perfect fit (as in sklearn)
+            ss_res = float(sq.sum())
+            ss_tot = float(((y_true - y_true.mean()) ** 2).sum())
+            if ss_tot > 0:
+                metrics['r2'] = 1.0 - ss_res / ss_tot
+            else:
+                metrics['r2'] = 1.0 if ss_res == 0 else 0.0
 
             logger.info(f"Regression metrics - RMSE: {metrics['rmse']:.4f}, R²: {metrics['r2']:.4f}")
 
         return metrics
 
-    def _get_feature_importance(self) -> List[Dict[str, Any]]:
+    def _get_feature_importance(
+        self,
+        X_test: np.ndarray,
+        y_test: np.ndarray
+    ) -> List[Dict[str, Any]]:
         """
         Extract feature importance from the model.
 
+        HistGradientBoosting has no built-in importances, so it falls back to
+        permutation importance on the held-out set.
+
+        Args:
+            X_test: Preprocessed test features
+            y_test: Encoded test target
+
         Returns:
             List of dictionaries with feature names and importance scores
         """
@@ -296,18 +560,29 @@ class MLTrainer:
                     importances = np.abs(self.model.coef_).mean(axis=0)
                 else:
                     importances = np.abs(self.model.coef_)
+            elif isinstance(self.model, (HistGradientBoostingClassifier, HistGradientBoostingRegressor)):
+                # Score drop when each feature is shuffled, on a bounded sample
+                # of the test set; negative drops are noise
+                logger.info("Computing permutation feature importance")
+                result = permutation_importance(
+                    self.model, X_test, y_test,
+                    n_repeats=PERMUTATION_IMPORTANCE_REPEATS,
+                    max_samples=min(len(X_test), PERMUTATION_IMPORTANCE_MAX_SAMPLES),
+                    random_state=42
+                )
+                importances = np.clip(result.importances_mean, 0.0, None)
             else:
                 logger.info("Model does not support feature importance")
-                return []
+                return importance_list
 
-            for feature, importance in zip(self.feature_names, importances):
-                importance_list.append({
-                    'feature': feature,
-                    'importance': float(importance)
-                })
-
-            # Sort by importance
-            importance_list.sort(key=lambda x: x['importance'], reverse=True)
+            # Sort by importance (descending)
+            importances = np.asarray(importances, dtype=np.float64)
+            order = np.argsort(importances)[::-1]
+            features = self.pipeline[:-1].get_feature_names_out()
+            importance_list = [
+                {'feature': str(features[i]), 'importance': float(importances[i])}
+                for i in order
+            ]
 
         except Exception as e:
             logger.error(f"Error calculating feature importance: {e}")
@@ -326,16 +601,17 @@ class MLTrainer:
 
         # Create model bundle
         model_bundle = {
-            'model': self.model,
-            'scaler': self.scaler,
+            'pipeline': self.pipeline,
             'label_encoder': self.label_encoder,
             'feature_names': self.feature_names,
+            'categorical_features': self.categorical_features,
+            'feature_types': self.feature_types,
             'algorithm': self.algorithm,
             'problem_type': self.problem_type
         }
 
-        # Save using joblib
-        joblib.dump(model_bundle, filepath)
+        # Save using joblib (protocol 5 pickles ndarrays out-of-band)
+        joblib.dump(model_bundle, filepath, compress=MODEL_COMPRESSION, protocol=5)
         logger.info(f"Model saved to {filepath}")
 
     @staticmethod
@@ -349,17 +625,22 @@ class MLTrainer:
         Returns:
             MLTrainer instance with loaded model
         """
-        model_bundle = joblib.load(filepath)
+        # Memory-map arrays from uncompressed files instead of copying them
+        with open(filepath, 'rb') as f:
+            is_compressed = f.read(1) != PICKLE_MAGIC
+        model_bundle = joblib.load(filepath, mmap_mode=None if is_compressed else 'r')
 
         trainer = MLTrainer(
             algorithm=model_bundle['algorithm'],
             problem_type=model_bundle['problem_type'],
             hyperparameters={}
         )
-        trainer.model = model_bundle['model']
-        trainer.scaler = model_bundle['scaler']
+        trainer.pipeline = model_bundle['pipeline']
+        trainer.model = trainer.pipeline[-1]
         trainer.label_encoder = model_bundle['label_encoder']
         trainer.feature_names = model_bundle['feature_names']
+        trainer.categorical_features = model_bundle['categorical_features']
+        trainer.feature_types = model_bundle['feature_types']
 
         logger.info(f"Model loaded from {filepath}")
         return trainer
@@ -388,7 +669,7 @@ def main():
 
         # Load dataset
         logger.info(f"Loading dataset from {dataset_path}")
-        df = pd.read_csv(dataset_path)
+        df = read_csv(dataset_path)
 
         # Validate target column
         if target_column not in df.columns:
@@ -400,12 +681,20 @@ def main():
 
         # Train-test split
         logger.info(f"Splitting data: {train_test_split_ratio*100}% train, {(1-train_test_split_ratio)*100}% test")
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y,
-            train_size=train_test_split_ratio,
-            random_state=42,
-            stratify=y if problem_type == 'classification' else None
-        )
+        if problem_type == 'classification':
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y,
+                train_size=train_test_split_ratio,
+                random_state=42,
+                stratify=y
+            )
+        else:
+            # No stratification needed: one shuffled index, one gather per split
+            indices = np.random.default_rng(42).permutation(len(df))
+            n_train = int(len(df) * train_test_split_ratio)
+            train_idx, test_idx = indices[:n_train], indices[n_train:]
+            X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
+            y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
 
         # Initialize trainer
         trainer = MLTrainer(algorithm, problem_type, hyperparameters)
@@ -4,12 +4,25 @@ Prediction Script for ML Insights Platform
 This script handles making predictions using trained models.
 """
 
+import os
 import sys
 import json
 import logging
+from contextlib import closing, nullcontext
 import pandas as pd
 import numpy as np
-from ml_trainer import MLTrainer
+from joblib import Parallel, delayed
+from sklearn import config_context
+from threadpoolctl import threadpool_limits
+from ml_trainer import MLTrainer, read_csv_chunks
+
+# PyArrow writers back the optional Arrow CSV and Parquet output formats
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
 
 # Configure logging
 logging.basicConfig(
@@ -19,14 +32,159 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def predict(model_path: str, input_data_path: str, output_path: str) -> dict:
+# Chunk size when streaming the input CSV: rows with pandas' parser, bytes
+# per block with PyArrow's
+PREDICT_CHUNK_SIZE = 65536
+PREDICT_BLOCK_SIZE = 8 * 1024 * 1024
+
+# Inputs smaller than this are predicted one chunk at a time; larger ones
+# fan chunks out to worker threads sharing the loaded model
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+# 'csv' is written by pandas; the others require pyarrow
+OUTPUT_FORMATS = ('csv', 'arrow_csv', 'parquet')
+
+
+def _process_chunk(trainer: MLTrainer, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Preprocess one chunk of input rows and append its predictions.
+
+    Args:
+        trainer: Trainer with the loaded model
+        df: Chunk of the input data
+
+    Returns:
+        Chunk with prediction columns added
+    """
+    # Validate features
+    missing_features = set(trainer.feature_names) - set(df.columns)
+    if missing_features:
+        raise ValueError(f"Missing required features: {missing_features}")
+
+    # Select and reorder features
+    X = df[trainer.feature_names]
+
+    if len(X) == 0:
+        # sklearn rejects empty input; an empty chunk still yields the output
+        # columns so that a header is written
+        predictions = np.empty(0)
+        probabilities = None
+        if hasattr(trainer.model, 'predict_proba'):
+            probabilities = np.empty((0, len(trainer.model.classes_)))
+    else:
+        # Preprocess data (imputation, encoding, scaling) with the training pipeline
+        X_processed = trainer.pipeline[:-1].transform(X)
+
+        # The preprocessor rejects infinities and imputes NaNs, so the model can
+        # skip sklearn's finiteness scan. Probabilistic models derive labels from
+        # a single predict_proba pass instead of also calling predict
+        with config_context(assume_finite=True):
+            if hasattr(trainer.model, 'predict_proba'):
+                probabilities = trainer.model.predict_proba(X_processed)
+                predictions = trainer.model.classes_[np.argmax(probabilities, axis=1)]
+                if trainer.problem_type == 'classification' and trainer.label_encoder is not None:
+                    # Decode predictions
+                    predictions = trainer.label_encoder.inverse_transform(predictions)
+            else:
+                predictions = trainer.model.predict(X_processed)
+                probabilities = None
+
+    # Create output dataframe
+    output_df = df.copy()
+    output_df['prediction'] = predictions
+
+    if probabilities is not None:
+        # Add confidence score (max probability)
+        output_df['confidence'] = probabilities.max(axis=1)
+
+        # For binary classification, add probability columns
+        if probabilities.shape[1] == 2:
+            output_df['probability_class_0'] = probabilities[:, 0]
+            output_df['probability_class_1'] = probabilities[:, 1]
+
+    return output_df
+
+
+class PredictionWriter:
+    """
+    Append prediction chunks to the output file in the requested format.
+
+    'csv' uses pandas' writer, which keeps the formatting of the echoed
+    input columns. 'arrow_csv' and 'parquet' use PyArrow's writers, with
+    the schema fixed by the first chunk.
+    """
+
+    def __init__(self, output_path: str, output_format: str = 'csv'):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        if output_format != 'csv' and pa is None:
+            raise ValueError(f"Output format '{output_format}' requires pyarrow")
+
+        self.output_path = output_path
+        self.output_format = output_format
+        self.output_file = open(output_path, 'w', newline='') if output_format == 'csv' else None
+        self.arrow_writer = None
+        self.schema = None
+        self.chunks_written = 0
+
+    def write(self, output_df: pd.DataFrame):
+        """
+        Append one chunk of predictions.
+
+        Args:
+            output_df: Chunk with prediction columns added
+        """
+        if self.output_file is not None:
+            output_df.to_csv(self.output_file, index=False, header=self.chunks_written == 0)
+            self.chunks_written += 1
+            return
+
+        table = pa.Table.from_pandas(output_df, preserve_index=False)
+        if self.arrow_writer is None:
+            # Columns that are all missing in the first chunk are stored as
+            # strings so later chunks with values still fit the schema
+            self.schema = pa.schema([
+                field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                for field in table.schema
+            ], metadata=table.schema.metadata)
+            if self.output_format == 'parquet':
+                self.arrow_writer = pq.ParquetWriter(self.output_path, self.schema, compression='zstd')
+            else:
+                self.arrow_writer = pa_csv.CSVWriter(self.output_path, self.schema)
+        self.arrow_writer.write_table(table.cast(self.schema))
+        self.chunks_written += 1
+
+    def close(self):
+        """Flush and close the output file."""
+        if self.output_file is not None:
+            self.output_file.close()
+        if self.arrow_writer is not None:
+            self.arrow_writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def predict(
+    model_path: str,
+    input_data_path: str,
+    output_path: str,
+    output_format: str = 'csv'
+) -> dict:
     """
     Make predictions using a trained model.
 
+    The input CSV is streamed in chunks so peak memory is bounded by the
+    chunk size; large inputs are predicted on all cores in parallel threads.
+
     Args:
         model_path: Path to the saved model
         input_data_path: Path to input CSV file
         output_path: Path to save predictions
+        output_format: One of OUTPUT_FORMATS
 
     Returns:
         Dictionary with prediction results
@@ -36,64 +194,45 @@ def predict(model_path: str, input_data_path: str, output_path: str) -> dict:
         logger.info(f"Loading model from {model_path}")
         trainer = MLTrainer.load_model(model_path)
 
-        # Load input data
+        # Stream input data
         logger.info(f"Loading input data from {input_data_path}")
-        df = pd.read_csv(input_data_path)
+        # Parsed with the training parser and column types, so every chunk
+        # matches what the model learned
+        chunks = read_csv_chunks(
+            input_data_path,
+            column_types=trainer.feature_types,
+            string_columns=trainer.categorical_features,
+            chunksize=PREDICT_CHUNK_SIZE,
+            block_size=PREDICT_BLOCK_SIZE
+        )
+        n_jobs = -1 if os.path.getsize(input_data_path) >= PARALLEL_MIN_BYTES else 1
 
-        # Validate features
-        missing_features = set(trainer.feature_names) - set(df.columns)
-        if missing_features:
-            raise ValueError(f"Missing required features: {missing_features}")
+        # Sequential chunks use all cores inside the estimator; parallel
+        # chunks already occupy every core, so the estimator runs single-threaded
+        if hasattr(trainer.model, 'n_jobs'):
+            trainer.model.n_jobs = -1 if n_jobs == 1 else 1
 
-        # Select and reorder features
-        X = df[trainer.feature_names]
-
-        # Preprocess data (same as training)
-        from sklearn.preprocessing import LabelEncoder
-        categorical_cols = X.select_dtypes(include=['object', 'category']).columns
-        if len(categorical_cols) > 0:
-            for col in categorical_cols:
-                le = LabelEncoder()
-                X[col] = le.fit_transform(X[col].astype(str))
-
-        # Apply scaling if model was trained with scaling
-        if trainer.scaler is not None:
-            X_scaled = trainer.scaler.transform(X)
-            X = pd.DataFrame(X_scaled, columns=X.columns)
-
-        # Make predictions
+        # Make predictions, writing each chunk as soon as it is ready. Threads
+        # share the model instead of pickling it to worker processes; sklearn
+        # and numpy release the GIL in the heavy predict kernels
         logger.info("Making predictions...")
-        predictions = trainer.model.predict(X.values)
+        prediction_count = 0
+        # Native thread pools (OpenMP, BLAS) are also capped to one thread per
+        # chunk while chunks run in parallel
+        thread_limit = threadpool_limits(limits=1) if n_jobs != 1 else nullcontext()
+        with closing(chunks), thread_limit, PredictionWriter(output_path, output_format) as writer:
+            results = Parallel(n_jobs=n_jobs, backend='threading', return_as='generator')(
+                delayed(_process_chunk)(trainer, chunk) for chunk in chunks
+            )
+            for output_df in results:
+                writer.write(output_df)
+                prediction_count += len(output_df)
 
-        # Get prediction probabilities if available
-        if hasattr(trainer.model, 'predict_proba'):
-            probabilities = trainer.model.predict_proba(X.values)
-            if trainer.problem_type == 'classification' and trainer.label_encoder is not None:
-                # Decode predictions
-                predictions = trainer.label_encoder.inverse_transform(predictions)
-        else:
-            probabilities = None
-
-        # Create output dataframe
-        output_df = df.copy()
-        output_df['prediction'] = predictions
-
-        if probabilities is not None:
-            # Add confidence score (max probability)
-            output_df['confidence'] = probabilities.max(axis=1)
-
-            # For binary classification, add probability columns
-            if probabilities.shape[1] == 2:
-                output_df['probability_class_0'] = probabilities[:, 0]
-                output_df['probability_class_1'] = probabilities[:, 1]
-
-        # Save predictions
-        logger.info(f"Saving predictions to {output_path}")
-        output_df.to_csv(output_path, index=False)
+        logger.info(f"Saved predictions to {output_path}")
 
         return {
             'success': True,
-            'prediction_count': len(predictions),
+            'prediction_count': prediction_count,
             'output_path': output_path
         }
 
@@ -118,9 +257,10 @@ def main():
         model_path = config['model_path']
         input_data_path = config['input_data_path']
         output_path = config['output_path']
+        output_format = config.get('output_format', 'csv')
 
         # Make predictions
-        result = predict(model_path, input_data_path, output_path)
+        result = predict(model_path, input_data_path, output_path, output_format)
 
         # Output results as JSON
         print(json.dumps(result))
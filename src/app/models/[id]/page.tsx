@@ -12,7 +12,7 @@ import { ConfusionMatrix } from '@/components/charts/ConfusionMatrix'
 import { useAuth } from '@/lib/auth-context'
 import { supabase } from '@/lib/supabase'
 import { Model } from '@/types'
-import { formatDate, formatPercentage, formatNumber } from '@/lib/utils'
+import { formatDate, formatPercentage, formatNumber, getConfusionMatrix } from '@/lib/utils'
 import { ALGORITHMS } from '@/lib/constants'
 
 export default function ModelDetailPage() {
@@ -64,6 +64,7 @@ export default function ModelDetailPage() {
   }
 
   const algorithm = ALGORITHMS[model.algorithm]
+  const confusionMatrix = getConfusionMatrix(model.metrics)
 
   return (
     <div className="min-h-screen flex flex-col">
@@ -278,8 +279,8 @@ export default function ModelDetailPage() {
 
         {/* Confusion Matrix (for classification models) */}
         {model.problem_type === 'classification' &&
-         model.metrics.confusion_matrix &&
-         model.metrics.confusion_matrix.length > 0 && (
+         confusionMatrix &&
+         confusionMatrix.length > 0 && (
           <Card className="mb-6">
             <CardHeader>
               <CardTitle>Confusion Matrix</CardTitle>
@@ -288,7 +289,7 @@ export default function ModelDetailPage() {
               </p>
             </CardHeader>
             <CardContent>
-              <ConfusionMatrix matrix={model.metrics.confusion_matrix} />
+              <ConfusionMatrix matrix={confusionMatrix} />
             </CardContent>
           </Card>
         )}
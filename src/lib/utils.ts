@@ -1,4 +1,5 @@
 import { type ClassValue, clsx } from 'clsx'
+import type { ModelMetrics } from '@/types'
 
 // Utility for merging Tailwind classes
 export function cn(...inputs: ClassValue[]) {
@@ -153,3 +154,16 @@ export function calculateMax(values: number[]): number {
   if (values.length === 0) return 0
   return Math.max(...values)
 }
+
+// Decode metrics
+export function getConfusionMatrix(metrics: ModelMetrics): number[][] | undefined {
+  if (metrics.confusion_matrix) return metrics.confusion_matrix
+  if (!metrics.confusion_matrix_b64 || !metrics.confusion_matrix_shape) return undefined
+
+  const [rows, cols] = metrics.confusion_matrix_shape
+  const binary = atob(metrics.confusion_matrix_b64)
+  const view = new DataView(Uint8Array.from(binary, (c) => c.charCodeAt(0)).buffer)
+  return Array.from({ length: rows }, (_, i) =>
+    Array.from({ length: cols }, (_, j) => view.getInt32((i * cols + j) * 4, true))
+  )
+}
@@ -66,6 +66,9 @@ export interface ModelMetrics {
   f1_score?: number
   roc_auc?: number
   confusion_matrix?: number[][]
+  // Large confusion matrices: base64 little-endian int32 counts, row-major
+  confusion_matrix_b64?: string
+  confusion_matrix_shape?: [number, number]
 
   // Regression metrics
   rmse?: number